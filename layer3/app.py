@@ -1,36 +1,80 @@
 import os
 import json
-import subprocess
+import asyncio
 import logging
-from typing import Optional, List, Dict
+import queue
+import atexit
+import hashlib
+import itertools
+import re
+import shutil
+import tempfile
+import orjson
+import sqlite3
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional, List, Dict, Tuple
 from fastapi import FastAPI, HTTPException, Depends, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field
-from dotenv import load_dotenv
-from web3 import Web3
-from web3.middleware import geth_poa_middleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
+from cachetools import LRUCache, TTLCache
+from dotenv import load_dotenv, dotenv_values
+import aiohttp
+from web3 import AsyncWeb3, AsyncHTTPProvider, WebsocketProviderV2
+from web3.middleware import async_construct_simple_cache_middleware, async_geth_poa_middleware
+from web3.exceptions import BadFunctionCallOutput, ContractLogicError, TimeExhausted
+from eth_abi import decode as abi_decode
+from eth_utils.abi import collapse_if_tuple, event_abi_to_log_topic, function_abi_to_4byte_selector
+from eth_utils import function_signature_to_4byte_selector
 import uvicorn
 import sys
 import traceback
 from passlib.context import CryptContext # Added for password hashing
 
 # --- Password Hashing Setup ---
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-CREDENTIALS_FILE = "user_credentials.json"
+# argon2id for new hashes; existing bcrypt hashes still verify and are upgraded on the next login
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__memory_cost=19456,
+    argon2__time_cost=2,
+    argon2__parallelism=1,
+)
+CREDENTIALS_FILE = "user_credentials.json"  # Legacy store, imported into the database on first run
+CREDENTIALS_DB = os.getenv("SWIFTPAY_USERS_DB", "users.db")
 # --- End Password Hashing Setup ---
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging: callers only enqueue records, a background thread writes them out
+log_queue = queue.SimpleQueue()
+logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(log_queue)])
+log_listener = QueueListener(log_queue, logging.StreamHandler(), respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
 logger = logging.getLogger(__name__)
 
 # Load environment variables from .env file
 load_dotenv()
 
+def dump_json(content) -> bytes:
+    """Serialize content with orjson, falling back to the stdlib for integers wider than 64 bits."""
+    try:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    except TypeError:  # uint256 amounts can exceed what orjson encodes
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+class SwiftPayJSONResponse(ORJSONResponse):
+    """Serialize responses with orjson, falling back to the stdlib for integers wider than 64 bits."""
+
+    def render(self, content) -> bytes:
+        return dump_json(content)
+
 app = FastAPI(
     title="SwiftPay API",
     description="API for interacting with SwiftPay blockchain transactions and user authentication", # Updated description
     version="1.0.0",
+    default_response_class=SwiftPayJSONResponse,
 )
 
 # Add CORS middleware to allow cross-origin requests
@@ -42,22 +86,99 @@ app.add_middleware(
     allow_headers=["*"],  # Allow all headers
 )
 
+# Compress larger responses (transaction listings) for clients that accept gzip
+GZIP_MIN_SIZE = int(os.getenv("SWIFTPAY_GZIP_MIN_SIZE", "1024"))  # bytes; smaller bodies aren't worth the CPU
+GZIP_LEVEL = int(os.getenv("SWIFTPAY_GZIP_LEVEL", "5"))
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MIN_SIZE, compresslevel=GZIP_LEVEL)
+
 # Default hardhat node URL
 HARDHAT_URL = os.getenv("HARDHAT_URL", "http://localhost:8545")
+# WebSocket endpoint for pushed transaction events (set empty to disable the feed)
+HARDHAT_WS_URL = os.getenv("HARDHAT_WS_URL", "ws://localhost:8545")
+
+# Number of keep-alive connections kept open to the node
+RPC_POOL_MAXSIZE = int(os.getenv("SWIFTPAY_POOL_MAXSIZE", "100"))
+# Seconds an idle connection to the node stays open for reuse
+RPC_KEEPALIVE_TIMEOUT = float(os.getenv("SWIFTPAY_RPC_KEEPALIVE", "60"))
+# Seconds allowed for a single RPC call, and for the TCP connect to the node. sock_connect rather than
+# connect, since aiohttp's connect deadline also covers queueing for a free pooled connection under load
+RPC_TIMEOUT = aiohttp.ClientTimeout(
+    total=float(os.getenv("SWIFTPAY_RPC_TIMEOUT", "10")),
+    sock_connect=float(os.getenv("SWIFTPAY_RPC_CONNECT_TIMEOUT", "1")),
+)
+# Batches carry many calls, so they get a longer overall deadline but the same socket connect timeout
+RPC_BATCH_TIMEOUT = aiohttp.ClientTimeout(total=30, sock_connect=RPC_TIMEOUT.sock_connect)
+
+# Maximum number of eth_calls sent in a single JSON-RPC batch request
+RPC_BATCH_SIZE = int(os.getenv("SWIFTPAY_BATCH_SIZE", "500"))
+
+# Attempts for a batch request that fails at the connection level (the provider retries single calls itself)
+RPC_BATCH_RETRIES = max(1, int(os.getenv("SWIFTPAY_BATCH_RETRIES", "3")))
+RPC_RETRY_BACKOFF = 0.1  # seconds, doubled after each failed attempt
+
+# Seconds a cached contract read stays valid
+CALL_CACHE_LATEST_TTL = int(os.getenv("SWIFTPAY_CALL_CACHE_TTL", "1"))
+
+# Server backpressure limit (requests past the concurrency limit get HTTP 503)
+LIMIT_CONCURRENCY = int(os.getenv("SWIFTPAY_LIMIT", "256"))
+# uvicorn exits (it does not restart) after this many requests, so only set it under a process manager
+# such as gunicorn that replaces exited workers. Unset by default
+LIMIT_MAX_REQUESTS = int(os.getenv("SWIFTPAY_MAX_REQ")) if os.getenv("SWIFTPAY_MAX_REQ") else None
+TIMEOUT_KEEP_ALIVE = int(os.getenv("SWIFTPAY_KEEP_ALIVE", "30"))
+
+# The nonce counter and credential mirror are per process, so the server must run as a single worker
+if int(os.getenv("UVICORN_WORKERS", "1")) > 1:
+    raise RuntimeError("UVICORN_WORKERS > 1 is not supported: workers would reuse sender nonces and miss users registered elsewhere")
 
 # Global variable for blockchain connection
 w3 = None
 connected = False
 
+# Contract instances by address; building one parses and indexes the whole ABI
+_contract_cache = LRUCache(maxsize=8)
+
+# Shared HTTP session for the provider and batch requests (aiohttp sets TCP_NODELAY on its sockets)
+rpc_session = None
+
+def make_rpc_session():
+    """Create the aiohttp session used for JSON-RPC calls to the node."""
+    connector = aiohttp.TCPConnector(
+        limit=RPC_POOL_MAXSIZE,
+        limit_per_host=RPC_POOL_MAXSIZE,  # Every request goes to the same node
+        keepalive_timeout=RPC_KEEPALIVE_TIMEOUT,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=RPC_TIMEOUT,
+        headers={"Connection": "keep-alive", "Content-Type": "application/json"},
+    )
+
+async def make_web3():
+    """Build an AsyncWeb3 instance on the shared RPC session."""
+    # web3 would otherwise pass its own 10s total timeout with every request
+    provider = AsyncHTTPProvider(HARDHAT_URL, request_kwargs={"timeout": RPC_TIMEOUT})
+    await provider.cache_async_session(rpc_session)
+    instance = AsyncWeb3(provider)
+    instance.middleware_onion.inject(async_geth_poa_middleware, layer=0)  # For compatibility with Hardhat
+    # The validation middleware asks for the chain ID before every eth_call; answer it from memory
+    instance.middleware_onion.add(
+        await async_construct_simple_cache_middleware(rpc_whitelist={"eth_chainId"}),
+        "chain_id_cache",
+    )
+    return instance
+
 # Initialize Web3 connection
-def init_web3():
-    global w3, connected
+async def init_web3():
+    global w3, connected, rpc_session
     try:
-        w3 = Web3(Web3.HTTPProvider(HARDHAT_URL))
-        w3.middleware_onion.inject(geth_poa_middleware, layer=0)  # For compatibility with Hardhat
-        connected = w3.is_connected()
+        if rpc_session is None or rpc_session.closed:
+            rpc_session = make_rpc_session()
+        w3 = await make_web3()
+        _contract_cache.clear()  # Cached instances are bound to the previous Web3 object
+        connected = await w3.is_connected()
         if connected:
             logger.info(f"Connected to blockchain at {HARDHAT_URL}")
+            await check_chain_identity()
             return True
         else:
             logger.warning(f"Failed to connect to blockchain at {HARDHAT_URL}")
@@ -67,8 +188,72 @@ def init_web3():
         connected = False
         return False
 
-# Try to connect on startup
-init_web3()
+WEB3_CONNECT_ATTEMPTS = 5
+WEB3_CONNECT_TIMEOUT = 5  # seconds allowed per connection attempt
+
+async def connect_with_retry():
+    """Connect to the blockchain node, backing off exponentially while it boots."""
+    for attempt in range(1, WEB3_CONNECT_ATTEMPTS + 1):
+        try:
+            if await asyncio.wait_for(init_web3(), timeout=WEB3_CONNECT_TIMEOUT):
+                logger.info(f"Blockchain connection established after {attempt} attempt(s)")
+                return True
+        except asyncio.TimeoutError:
+            logger.warning(f"Connection attempt {attempt} to {HARDHAT_URL} timed out")
+        if attempt < WEB3_CONNECT_ATTEMPTS:
+            await asyncio.sleep(2 ** (attempt - 1))
+    logger.warning(f"Giving up on {HARDHAT_URL} after {WEB3_CONNECT_ATTEMPTS} attempts")
+    return False
+
+WATCHDOG_INTERVAL = float(os.getenv("SWIFTPAY_WATCHDOG_INTERVAL", "5"))  # seconds between liveness checks
+
+# Genesis block hash of the node last seen; a restarted Hardhat node comes back with a new one
+_chain_identity = None
+
+async def check_chain_identity():
+    """Drop chain-derived caches when the node turns out to be a different chain than before.
+
+    A restarted Hardhat node reuses the same contract addresses, so caches keyed by address alone would
+    otherwise keep serving user IDs and transactions from the previous chain.
+    """
+    global _chain_identity
+    genesis = (await w3.eth.get_block(0))["hash"]
+    if _chain_identity is not None and genesis != _chain_identity:
+        logger.warning(f"Blockchain at {HARDHAT_URL} was reset; clearing cached chain state")
+        forget_users()
+        forget_transactions()
+        _call_cache_latest.clear()
+        async with _nonce_lock:
+            await sync_sender()
+        start_transaction_feed()
+    _chain_identity = genesis
+
+async def connection_watchdog():
+    """Keep the `connected` flag current, reconnecting in the background so requests never wait on it."""
+    global connected
+    while True:
+        await asyncio.sleep(WATCHDOG_INTERVAL)
+        try:
+            # Reading the genesis block doubles as the liveness probe
+            alive = w3 is not None
+            if alive:
+                await asyncio.wait_for(check_chain_identity(), timeout=WEB3_CONNECT_TIMEOUT)
+        except Exception:
+            alive = False
+
+        if alive:
+            if not connected:
+                logger.info(f"Connection to blockchain at {HARDHAT_URL} restored")
+            connected = True
+            continue
+
+        if connected:
+            logger.warning(f"Lost connection to blockchain at {HARDHAT_URL}")
+        connected = False
+        try:
+            await asyncio.wait_for(init_web3(), timeout=WEB3_CONNECT_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning(f"Reconnect attempt to {HARDHAT_URL} timed out")
 
 # Load contract ABI from artifacts
 def load_contract_abi():
@@ -78,68 +263,218 @@ def load_contract_abi():
             logger.error(f"ABI file not found at {abi_file_path}")
             return None
             
-        with open(abi_file_path, "r") as f:
-            contract_json = json.load(f)
+        with open(abi_file_path, "rb") as f:
+            contract_json = orjson.loads(f.read())
             logger.info("Contract ABI loaded successfully")
             return contract_json["abi"]
     except Exception as e:
         logger.error(f"Error loading contract ABI: {e}")
         return None
 
+async def warm_rpc_pool():
+    """Open every pooled connection to the node so early requests skip DNS and TCP setup."""
+    try:
+        # block_number, unlike chain_id, is never answered from the middleware cache
+        await asyncio.gather(*(w3.eth.block_number for _ in range(RPC_POOL_MAXSIZE)))
+        logger.info(f"Warmed {RPC_POOL_MAXSIZE} connections to {HARDHAT_URL}")
+    except Exception as e:
+        logger.warning(f"Could not warm connection pool: {e}")
+
+async def load_contract_abi_async():
+    """Load the contract ABI off the event loop if it wasn't available at import time."""
+    global CONTRACT_ABI
+    if CONTRACT_ABI is None:
+        CONTRACT_ABI = await asyncio.get_running_loop().run_in_executor(None, load_contract_abi)
+    return CONTRACT_ABI
+
 CONTRACT_ABI = load_contract_abi()
 DEFAULT_CONTRACT_ADDRESS = os.getenv("CONTRACT_ADDRESS")
 
+def build_abi_maps(abi):
+    """Index the ABI by function selector and event topic so decoding is a dict lookup."""
+    selector_map = {}
+    event_topic_map = {}
+    for entry in abi or []:
+        if entry["type"] == "function":
+            selector_map[function_abi_to_4byte_selector(entry)] = (
+                entry["name"],
+                [collapse_if_tuple(arg) for arg in entry["inputs"]],
+                [collapse_if_tuple(arg) for arg in entry["outputs"]],
+            )
+        elif entry["type"] == "event":
+            indexed = [(arg["name"], collapse_if_tuple(arg)) for arg in entry["inputs"] if arg["indexed"]]
+            data = [(arg["name"], collapse_if_tuple(arg)) for arg in entry["inputs"] if not arg["indexed"]]
+            event_topic_map[event_abi_to_log_topic(entry)] = (
+                entry["name"],
+                indexed,
+                [name for name, _ in data],
+                [arg_type for _, arg_type in data],
+            )
+    return selector_map, event_topic_map
+
+def index_contract_abi():
+    """Rebuild the selector/topic lookups for the current CONTRACT_ABI."""
+    app.state.selector_map, app.state.event_topic_map = build_abi_maps(CONTRACT_ABI)
+    app.state.tx_created_topic = next(
+        (topic for topic, event in app.state.event_topic_map.items() if event[0] == "TransactionCreated"), None
+    )
+
+def decode_event_log(log):
+    """Decode a receipt log using the precomputed topic map. Returns (event_name, args) or None."""
+    topics = log["topics"]
+    if not topics:
+        return None
+    entry = app.state.event_topic_map.get(bytes(topics[0]))
+    if entry is None:
+        return None
+    name, indexed, data_names, data_types = entry
+    args = {}
+    for (arg_name, arg_type), topic in zip(indexed, topics[1:]):
+        # Dynamic indexed values are stored as their hash, so keep the raw topic
+        if arg_type in ("string", "bytes") or arg_type.endswith("]"):
+            args[arg_name] = bytes(topic)
+        else:
+            args[arg_name] = abi_decode([arg_type], bytes(topic))[0]
+    args.update(zip(data_names, abi_decode(data_types, bytes(log["data"]))))
+    return name, args
+
 # --- User Credential Store (Off-Chain) ---
-def load_user_credentials() -> Dict[str, Dict]:
-    """Load user credentials from the JSON file."""
+def load_legacy_credentials() -> Dict[str, Dict]:
+    """Load user credentials from the legacy JSON file."""
     if not os.path.exists(CREDENTIALS_FILE):
         return {}
     try:
-        with open(CREDENTIALS_FILE, "r") as f:
-            return json.load(f)
-    except json.JSONDecodeError:
-        logger.error(f"Error decoding {CREDENTIALS_FILE}. Starting with empty credentials.")
+        with open(CREDENTIALS_FILE, "rb") as f:
+            return orjson.loads(f.read())
+    except orjson.JSONDecodeError:
+        logger.error(f"Error decoding {CREDENTIALS_FILE}. Skipping legacy credentials.")
         return {}
     except Exception as e:
-        logger.error(f"Error loading user credentials: {e}")
+        logger.error(f"Error loading legacy credentials: {e}")
         return {}
 
-def save_user_credentials(credentials: Dict[str, Dict]):
-    """Save user credentials to the JSON file."""
+def open_credentials_db() -> sqlite3.Connection:
+    """Open the credentials database, creating it from the legacy JSON file if needed."""
+    conn = sqlite3.connect(CREDENTIALS_DB, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS users ("
+        "username TEXT PRIMARY KEY, hashed_password TEXT NOT NULL, blockchain_uuid INTEGER)"
+    )
+    if conn.execute("SELECT 1 FROM users LIMIT 1").fetchone() is None:
+        legacy = load_legacy_credentials()
+        if legacy:
+            with conn:
+                conn.executemany(
+                    "INSERT INTO users (username, hashed_password, blockchain_uuid) VALUES (?, ?, ?)",
+                    [(name, info["hashed_password"], info.get("blockchain_uuid")) for name, info in legacy.items()],
+                )
+            logger.info(f"Imported {len(legacy)} users from {CREDENTIALS_FILE} into {CREDENTIALS_DB}")
+    return conn
+
+def load_user_credentials() -> Tuple[Dict[str, str], Dict[str, Optional[int]]]:
+    """Load every user's password hash and blockchain UUID from the database."""
+    hash_by_user = {}
+    uuid_by_user = {}
+    for username, hashed_password, blockchain_uuid in credentials_conn.execute(
+        "SELECT username, hashed_password, blockchain_uuid FROM users"
+    ):
+        hash_by_user[username] = hashed_password
+        uuid_by_user[username] = blockchain_uuid
+    return hash_by_user, uuid_by_user
+
+def insert_user_credentials(username: str, hashed_password: str, blockchain_uuid: Optional[int]):
+    """Insert a new user's credentials; raises sqlite3.IntegrityError if the username is taken."""
+    with credentials_conn:
+        credentials_conn.execute(
+            "INSERT INTO users (username, hashed_password, blockchain_uuid) VALUES (?, ?, ?)",
+            (username, hashed_password, blockchain_uuid),
+        )
+    _hash_by_user[username] = hashed_password
+    _uuid_by_user[username] = blockchain_uuid
+
+def update_password_hash(username: str, hashed_password: str):
+    """Replace an existing user's password hash, keeping the in-memory mirror in step."""
     try:
-        with open(CREDENTIALS_FILE, "w") as f:
-            json.dump(credentials, f, indent=4)
-    except Exception as e:
-        logger.error(f"Error saving user credentials: {e}")
+        with credentials_conn:
+            credentials_conn.execute(
+                "UPDATE users SET hashed_password = ? WHERE username = ?",
+                (hashed_password, username),
+            )
+    except sqlite3.Error as e:
+        logger.error(f"Error updating password hash: {e}")
+        return
+    _hash_by_user[username] = hashed_password
 
-user_credentials_db = load_user_credentials()
+# The database is the source of truth; these dicts mirror it so a login is a single lookup
+credentials_conn = open_credentials_db()
+_hash_by_user, _uuid_by_user = load_user_credentials()
 # --- End User Credential Store ---
 
+# Probe endpoints are polled every second or so; keep them out of the request log
+PROBE_PATHS = {"/healthz", "/readyz"}
+
 # Middleware to log requests and handle exceptions
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     try:
-        logger.info(f"Request path: {request.url.path}")
+        if request.url.path not in PROBE_PATHS:
+            logger.info(f"Request path: {request.url.path}")
         response = await call_next(request)
         return response
     except Exception as e:
         logger.error(f"Unhandled exception: {e}")
         logger.error(traceback.format_exc())
-        return JSONResponse(
+        return SwiftPayJSONResponse(
             status_code=500,
             content={"detail": f"Internal server error: {str(e)}"}
         )
 
+class RPCBatchError(Exception):
+    """The node's reply to a JSON-RPC batch request doesn't match the calls that were sent."""
+
+# Translate blockchain errors into HTTP errors
+def web3_http_error(e: Exception, action: str) -> HTTPException:
+    """Map an exception from a blockchain call to the HTTPException a handler should raise."""
+    if isinstance(e, HTTPException):
+        return e  # Already carries the intended status (e.g. 404 for unknown users)
+    if isinstance(e, ContractLogicError):
+        return HTTPException(status_code=400, detail=e.message or "Contract call reverted")
+    if isinstance(e, BadFunctionCallOutput):
+        return HTTPException(status_code=400, detail="Contract returned no data. Is the contract deployed at this address?")
+    if isinstance(e, (TimeExhausted, asyncio.TimeoutError)):
+        return HTTPException(status_code=504, detail="Timed out waiting for the blockchain node")
+    if isinstance(e, RPCBatchError):
+        return HTTPException(status_code=502, detail=f"{action}: {e}")
+    if isinstance(e, aiohttp.ClientConnectionError):
+        return HTTPException(status_code=503, detail="Not connected to blockchain node. Is Hardhat running?")
+    logger.exception(f"{action}: {e}")
+    return HTTPException(status_code=500, detail=f"{action}: {str(e)}")
+
+# Liveness probe: never touches the blockchain node
+@app.get("/healthz")
+async def healthz():
+    return {"ok": True}
+
+# Readiness probe: 503 until startup has finished and the node is reachable
+@app.get("/readyz")
+async def readyz():
+    if getattr(app.state, "ready", False) and connected:
+        return SwiftPayJSONResponse({"ready": True}, status_code=200)
+    return SwiftPayJSONResponse({"ready": False}, status_code=503)
+
+# Chain ID and accounts barely change, so status pollers share one lookup per TTL window
+STATUS_CACHE_TTL = float(os.getenv("SWIFTPAY_STATUS_TTL", "5"))
+_status_cache = TTLCache(maxsize=1, ttl=STATUS_CACHE_TTL)
+_status_lock = asyncio.Lock()
+
 # Connection status
 @app.get("/api/status")
-def get_status():
+async def get_status():
     """Check connection status to the blockchain."""
     try:
-        # Try to reconnect if not connected
-        global connected
-        if not connected:
-            init_web3()
-            
+        # The connection watchdog keeps `connected` current, so no reconnect happens here
         if not w3 or not connected:
             return {
                 "connected": False,
@@ -148,8 +483,10 @@ def get_status():
                 "contractLoaded": CONTRACT_ABI is not None
             }
         
-        chain_id = w3.eth.chain_id
-        accounts = w3.eth.accounts
+        async with _status_lock:
+            if "node" not in _status_cache:
+                _status_cache["node"] = await asyncio.gather(w3.eth.chain_id, w3.eth.accounts)
+            chain_id, accounts = _status_cache["node"]
         
         return {
             "connected": True,
@@ -160,18 +497,11 @@ def get_status():
             "contractLoaded": CONTRACT_ABI is not None
         }
     except Exception as e:
-        logger.error(f"Error in get_status: {e}")
-        raise HTTPException(status_code=500, detail=f"Error connecting to blockchain: {str(e)}")
+        raise web3_http_error(e, "Error connecting to blockchain")
 
 # Contract instance getter
-def get_contract(contract_address: Optional[str] = None):
+async def get_contract(contract_address: Optional[str] = None):
     """Get contract instance using the specified address or default."""
-    global connected
-    
-    # If not connected, try to reconnect
-    if not connected:
-        init_web3()
-    
     address = contract_address or DEFAULT_CONTRACT_ADDRESS
     
     if not address:
@@ -187,60 +517,372 @@ def get_contract(contract_address: Optional[str] = None):
             logger.error("Cannot get contract: ABI not available")
             raise HTTPException(status_code=500, detail="Contract ABI not available. Is the contract compiled?")
             
-        contract = w3.eth.contract(address=address, abi=CONTRACT_ABI)
+        # Keyed on the ABI too, so a reloaded ABI never hands out instances built from the old one
+        key = (address, id(CONTRACT_ABI))
+        contract = _contract_cache.get(key)
+        if contract is None:
+            contract = w3.eth.contract(address=address, abi=CONTRACT_ABI)
+            _contract_cache[key] = contract
         return contract
     except Exception as e:
-        logger.error(f"Error getting contract: {e}")
-        raise HTTPException(status_code=500, detail=f"Error getting contract: {str(e)}")
+        raise web3_http_error(e, "Error getting contract")
+
+# --- Contract Read Cache ---
+# Reads only live for a short TTL, and send_transaction clears the cache after every write
+_call_cache_latest = TTLCache(maxsize=4096, ttl=CALL_CACHE_LATEST_TTL)
+
+async def cached_call(contract_fn):
+    """Run a contract read at the latest block through the in-process cache."""
+    args_hash = hashlib.blake2b(repr(contract_fn.args).encode(), digest_size=16).hexdigest()
+    key = f"call:{contract_fn.address}:{contract_fn.selector}:{args_hash}"
+
+    if key in _call_cache_latest:
+        return _call_cache_latest[key]
+    result = await contract_fn.call()
+    _call_cache_latest[key] = result
+    return result
+# --- End Contract Read Cache ---
+
+# --- User Identity Cache ---
+# A username's user ID never changes once assigned, so lookups are kept until the contract is redeployed
+USER_CACHE_SIZE = int(os.getenv("SWIFTPAY_USER_CACHE_SIZE", "100000"))
+_uid_by_name = LRUCache(maxsize=USER_CACHE_SIZE)
+_name_by_uid = LRUCache(maxsize=USER_CACHE_SIZE)
+
+# Precomputed so name lookups can be sent as raw eth_calls
+_TRY_NAME_SELECTOR = "0x" + function_signature_to_4byte_selector("tryGetUserNameById(uint256)").hex()
+_TRY_NAME_OUTPUTS = ["string", "bool"]
+
+def remember_user(contract_address: str, username: str, user_id: int):
+    """Record a username <-> user ID pair for the given contract."""
+    _uid_by_name[(contract_address, username)] = user_id
+    _name_by_uid[(contract_address, user_id)] = username
+
+def forget_users():
+    """Drop every cached username <-> user ID pair."""
+    _uid_by_name.clear()
+    _name_by_uid.clear()
+
+async def user_id_for(contract, username: str) -> int:
+    """Resolve a username to its user ID, hitting the chain only on a cache miss.
+
+    Raises a 404 HTTPException for an unknown username.
+    """
+    user_id = _uid_by_name.get((contract.address, username))
+    if user_id is None:
+        user_id = await contract.functions.getUserIdByName(username).call()
+        if user_id == 0:  # No user has ID 0; not cached, since the name may be registered later
+            raise HTTPException(status_code=404, detail=f"User {username} does not exist")
+        remember_user(contract.address, username, user_id)
+    return user_id
+
+async def usernames_for(contract, user_ids) -> Dict[int, str]:
+    """Resolve user IDs to usernames, batching the lookups that miss the cache.
+
+    IDs with no registered username are left out of the result.
+    """
+    address = contract.address
+    names = {}
+    misses = []
+    for uid in user_ids:
+        name = _name_by_uid.get((address, uid))
+        if name is None:
+            misses.append(uid)
+        else:
+            names[uid] = name
+
+    if misses:
+        # The calldata is just the selector plus the ID as one 32-byte word, so skip web3's encoder.
+        # tryGetUserNameById never reverts, so an error entry is a real failure rather than an unknown user
+        requests = [(address, _TRY_NAME_SELECTOR + format(uid, "064x"), _TRY_NAME_OUTPUTS) for uid in misses]
+        for uid, result in zip(misses, await batch_eth_call(requests)):
+            if isinstance(result, Exception):
+                raise result
+            name, ok = result
+            if ok:
+                remember_user(address, name, uid)
+                names[uid] = name
+    return names
+# --- End User Identity Cache ---
+
+# --- Transaction Detail Cache ---
+# Transactions are append-only, so the details read at an index never change
+_tx_cache: List[tuple] = []
+_tx_cache_address: Optional[str] = None
+_tx_cache_lock = asyncio.Lock()
+
+def forget_transactions():
+    """Drop every cached transaction."""
+    global _tx_cache_address
+    _tx_cache.clear()
+    _tx_cache_address = None
+
+async def transaction_details(contract, tx_count: int) -> List[tuple]:
+    """Return the details of the first tx_count transactions, fetching only indices not cached yet."""
+    global _tx_cache_address
+    async with _tx_cache_lock:
+        # A different contract, or a chain that shrank (e.g. a restarted Hardhat node), invalidates everything
+        if _tx_cache_address != contract.address or tx_count < len(_tx_cache):
+            forget_transactions()
+            _tx_cache_address = contract.address
+
+        if len(_tx_cache) < tx_count:
+            get_details = contract.functions.getTransactionDetailsByIndex
+            details = await batch_call([get_details(i) for i in range(len(_tx_cache), tx_count)])
+            for result in details:
+                if isinstance(result, Exception):
+                    raise result
+            _tx_cache.extend(details)
+        return _tx_cache[:tx_count]
+
+# While the feed is subscribed, the cache for the default contract is known to be current
+_tx_feed_live = False
+
+async def refresh_transactions(contract):
+    """Pull any transactions the cache is missing."""
+    tx_count = await contract.functions.getTransactionCount().call()
+    await transaction_details(contract, tx_count)
+
+async def transaction_feed():
+    """Keep the transaction cache current from TransactionCreated log notifications."""
+    global _tx_feed_live
+    topic = app.state.tx_created_topic
+    if topic is None:
+        return
+
+    retry_delay = 1
+    while True:
+        try:
+            contract = await get_contract()
+            if contract is None:
+                return  # Nothing deployed yet; a deploy restarts the feed
+            async with AsyncWeb3.persistent_websocket(WebsocketProviderV2(HARDHAT_WS_URL)) as ws_w3:
+                await ws_w3.eth.subscribe("logs", {"address": contract.address, "topics": ["0x" + topic.hex()]})
+                await refresh_transactions(contract)  # Catch up on anything from before the subscription
+                _tx_feed_live = True
+                retry_delay = 1
+                logger.info(f"Subscribed to TransactionCreated events at {HARDHAT_WS_URL}")
+                async for _ in ws_w3.ws.process_subscriptions():
+                    await refresh_transactions(contract)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Transaction feed from {HARDHAT_WS_URL} unavailable ({e}), retrying in {retry_delay}s")
+        finally:
+            _tx_feed_live = False
+        await asyncio.sleep(retry_delay)
+        retry_delay = min(retry_delay * 2, 60)
+
+def start_transaction_feed():
+    """(Re)start the transaction feed for the current default contract."""
+    if not HARDHAT_WS_URL:
+        return
+    feed = getattr(app.state, "tx_feed", None)
+    if feed is not None:
+        feed.cancel()
+    app.state.tx_feed = asyncio.create_task(transaction_feed())
+# --- End Transaction Detail Cache ---
+
+async def batch_call(calls, block_identifier="latest"):
+    """Run several contract reads in one JSON-RPC batch request.
+
+    Returns one entry per call, in order: the decoded result, or the exception for a call that failed.
+    """
+    requests = []
+    for fn in calls:
+        _, input_types, output_types = app.state.selector_map[bytes.fromhex(fn.selector[2:])]
+        requests.append((fn.address, fn.selector + w3.codec.encode(input_types, fn.args).hex(), output_types))
+    return await batch_eth_call(requests, block_identifier)
+
+async def batch_eth_call(requests, block_identifier="latest"):
+    """Send pre-encoded (to, calldata hex, output types) eth_calls as JSON-RPC batch requests.
+
+    Returns one entry per request, in order: the decoded result, or the exception for a call that failed.
+    """
+    results = []
+    for start in range(0, len(requests), RPC_BATCH_SIZE):
+        chunk = requests[start:start + RPC_BATCH_SIZE]
+        payload = [
+            {
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "method": "eth_call",
+                "params": [{"to": to, "data": data}, block_identifier],
+            }
+            for request_id, (to, data, _) in enumerate(chunk)
+        ]
+
+        # eth_call is read-only, so a batch that hit a dropped connection is safe to resend
+        for attempt in range(RPC_BATCH_RETRIES):
+            try:
+                async with rpc_session.post(HARDHAT_URL, json=payload, timeout=RPC_BATCH_TIMEOUT) as response:
+                    response.raise_for_status()
+                    body = await response.json()
+                break
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt == RPC_BATCH_RETRIES - 1:
+                    raise
+                await asyncio.sleep(RPC_RETRY_BACKOFF * 2 ** attempt)
+
+        # A node that rejects the whole batch answers with a single error object instead of a list
+        if not isinstance(body, list):
+            error = body.get("error") if isinstance(body, dict) else None
+            message = error.get("message") if isinstance(error, dict) else repr(body)[:200]
+            raise RPCBatchError(f"Node rejected batch of {len(chunk)} calls: {message}")
+        replies = {reply.get("id"): reply for reply in body if isinstance(reply, dict)}
+        if len(body) != len(chunk) or replies.keys() != set(range(len(chunk))):
+            raise RPCBatchError(f"Node returned {len(body)} replies for a batch of {len(chunk)} calls")
+
+        for request_id, (_, _, output_types) in enumerate(chunk):
+            reply = replies[request_id]
+            if "error" in reply:
+                results.append(ContractLogicError(reply["error"].get("message", "Contract call reverted")))
+                continue
+            data = bytes.fromhex(reply["result"][2:])
+            if not data and output_types:
+                results.append(BadFunctionCallOutput("Contract call returned no data"))
+                continue
+            decoded = w3.codec.decode(output_types, data)
+            results.append(decoded[0] if len(decoded) == 1 else decoded)
+    return results
+
+# Sender account and its next nonce, tracked locally so writes skip eth_accounts/eth_getTransactionCount
+DEFAULT_SENDER = None
+_local_nonce = None
+_nonce_lock = asyncio.Lock()
+
+async def sync_sender():
+    """Load the first Hardhat account and its pending nonce from the node."""
+    global DEFAULT_SENDER, _local_nonce
+    accounts = await w3.eth.accounts
+    DEFAULT_SENDER = accounts[0] if accounts else None
+    _local_nonce = await w3.eth.get_transaction_count(DEFAULT_SENDER, "pending") if DEFAULT_SENDER else None
+    return DEFAULT_SENDER
 
 # Helper function for sending transactions in development mode
-def send_transaction(transaction):
+async def send_transaction(transaction):
     """Send a transaction using the first account from Hardhat's provided accounts"""
-    if not w3 or not w3.eth.accounts:
+    global _local_nonce
+    if not w3:
         raise HTTPException(status_code=500, detail="No accounts available. Is Hardhat running?")
     
     try:
-        # In development mode with Hardhat, we can send directly from the unlocked account
-        tx_hash = w3.eth.send_transaction(transaction)
+        # Nonces are handed out under the lock; waiting for the receipt happens outside it
+        async with _nonce_lock:
+            if DEFAULT_SENDER is None and not await sync_sender():
+                raise HTTPException(status_code=500, detail="No accounts available. Is Hardhat running?")
+            transaction.setdefault('from', DEFAULT_SENDER)
+            fill_nonce = transaction.get('nonce') is None
+            if fill_nonce:
+                transaction['nonce'] = _local_nonce
+            try:
+                # In development mode with Hardhat, we can send directly from the unlocked account
+                tx_hash = await w3.eth.send_transaction(transaction)
+            except Exception as send_error:
+                # The local nonce may have drifted (e.g. a restarted node), so take the node's view again
+                try:
+                    await sync_sender()
+                except Exception as sync_error:
+                    logger.warning(f"Could not resync nonce for {DEFAULT_SENDER}: {sync_error}")
+                    raise send_error
+                if not (fill_nonce and "nonce" in str(send_error).lower()):
+                    raise
+                # Someone else sent from this account; retry once with the node's nonce
+                logger.warning(f"Nonce {transaction['nonce']} rejected, retrying with {_local_nonce}")
+                transaction['nonce'] = _local_nonce
+                tx_hash = await w3.eth.send_transaction(transaction)
+            _local_nonce += 1
         logger.info(f"Transaction sent: {tx_hash.hex()}")
         
-        receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+        receipt = await w3.eth.wait_for_transaction_receipt(tx_hash)
         logger.info(f"Transaction mined: {tx_hash.hex()}, status: {receipt.status}")
         
         if receipt.status == 0:  # Transaction failed
             raise HTTPException(status_code=400, detail="Transaction failed on blockchain")
+        
+        # State changed, so cached "latest" reads are stale
+        _call_cache_latest.clear()
             
         return tx_hash, receipt
     except Exception as e:
-        logger.error(f"Error sending transaction: {e}")
-        raise HTTPException(status_code=500, detail=f"Error sending transaction: {str(e)}")
+        raise web3_http_error(e, "Error sending transaction")
+
+ENV_FILE = ".env"
+_ENV_KEY_RE = re.compile(r"^\s*(?:export\s+)?([A-Za-z_][A-Za-z0-9_.]*)\s*=")
+
+def _env_line(key: str, value: str) -> str:
+    """Format a KEY=value line, quoting the value the way dotenv's set_key does in "auto" mode."""
+    if not value.isalnum():
+        value = "'{}'".format(value.replace("'", "\\'"))
+    return f"{key}={value}\n"
+
+def update_env_file(updates: Dict[str, str]) -> bool:
+    """Set values in the .env file, keeping its comments and other keys as written. Returns False when nothing changed."""
+    # interpolate=False compares the raw values, so ${VAR} references elsewhere are never expanded and frozen
+    current = dotenv_values(ENV_FILE, interpolate=False) if os.path.exists(ENV_FILE) else {}
+    changed = {key: value for key, value in updates.items() if current.get(key) != value}
+    if not changed:
+        return False
+
+    lines = []
+    if os.path.exists(ENV_FILE):
+        with open(ENV_FILE, encoding="utf-8") as f:
+            lines = f.readlines()
+    # Rewrite matching lines in place and append any keys the file did not have yet
+    pending = dict(changed)
+    for i, line in enumerate(lines):
+        match = _ENV_KEY_RE.match(line)
+        if match and match.group(1) in pending:
+            lines[i] = _env_line(match.group(1), pending.pop(match.group(1)))
+    if pending and lines and not lines[-1].endswith("\n"):
+        lines[-1] += "\n"
+    lines.extend(_env_line(key, value) for key, value in pending.items())
+
+    # Write a sibling temp file and swap it in, so a crash never leaves a half-written .env
+    env_path = os.path.abspath(ENV_FILE)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(env_path), prefix=".env.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(env_path):
+            shutil.copymode(env_path, tmp_path)
+        os.replace(tmp_path, env_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return True
 
 # Deploy new contract
+DEPLOY_COMMAND = ["npx", "hardhat", "run", "scripts/deploy.ts", "--network", "localhost"]
+_DEPLOY_RE = re.compile(r"TransactionChain deployed to: (0x[a-fA-F0-9]{40})")
+
 @app.post("/api/contract/deploy")
 async def deploy_contract():
     """Deploy a new TransactionChain contract."""
     try:
         if not w3 or not connected:
-            if not init_web3():
-                raise HTTPException(status_code=503, detail="Not connected to blockchain node. Is Hardhat running?")
+            raise HTTPException(status_code=503, detail="Not connected to blockchain node. Is Hardhat running?")
             
         logger.info("Running contract deployment script...")
-        result = subprocess.run(
-            "npx hardhat run scripts/deploy.ts --network localhost",
-            shell=True,
-            capture_output=True,
-            text=True,
+        # Run the script without blocking the event loop so other requests keep being served
+        process = await asyncio.create_subprocess_exec(
+            *DEPLOY_COMMAND,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
             cwd="./"
         )
+        stdout, stderr = await process.communicate()
         
-        if result.returncode != 0:
-            logger.error(f"Deployment failed: {result.stderr}")
-            raise HTTPException(status_code=500, detail=f"Deployment failed: {result.stderr}")
+        if process.returncode != 0:
+            error_output = stderr.decode(errors="replace")
+            logger.error(f"Deployment failed: {error_output}")
+            raise HTTPException(status_code=500, detail=f"Deployment failed: {error_output}")
             
         # Extract contract address from the output
-        output = result.stdout
-        import re
-        match = re.search(r"TransactionChain deployed to: (0x[a-fA-F0-9]{40})", output)
+        output = stdout.decode(errors="replace")
+        match = _DEPLOY_RE.search(output)
         
         if not match:
             logger.error("Could not extract contract address from deployment output")
@@ -250,52 +892,68 @@ async def deploy_contract():
         logger.info(f"Contract deployed at: {contract_address}")
         
         # Save to .env file
-        with open(".env", "w") as f:
-            f.write(f"CONTRACT_ADDRESS={contract_address}\n")
-            f.write(f"HARDHAT_URL={HARDHAT_URL}\n")
+        update_env_file({"CONTRACT_ADDRESS": contract_address, "HARDHAT_URL": HARDHAT_URL})
             
+        # The deploy script recompiles first, so pick up the ABI it may have changed
+        global DEFAULT_CONTRACT_ADDRESS, CONTRACT_ABI
+        new_abi = await asyncio.get_running_loop().run_in_executor(None, load_contract_abi)
+        if new_abi is not None:
+            CONTRACT_ABI = new_abi
+            index_contract_abi()
+
         # Update global variable
-        global DEFAULT_CONTRACT_ADDRESS
         DEFAULT_CONTRACT_ADDRESS = contract_address
-        
+        _contract_cache.clear()
+        forget_users()
+        forget_transactions()
+        start_transaction_feed()
+
+        # The deploy script sends from the same Hardhat account, so the local nonce is now behind
+        async with _nonce_lock:
+            await sync_sender()
+
         return {"success": True, "contractAddress": contract_address, "output": output}
     except Exception as e:
-        logger.error(f"Error deploying contract: {e}")
-        raise HTTPException(status_code=500, detail=f"Error deploying contract: {str(e)}")
+        raise web3_http_error(e, "Error deploying contract")
 
 # Pydantic models for request validation
-class UserCreate(BaseModel):
+class RequestModel(BaseModel):
+    """Base for request bodies: unknown fields and oversized strings are rejected before a handler runs."""
+    model_config = ConfigDict(extra="forbid", str_max_length=128)
+
+class UserCreate(RequestModel):
     username: str = Field(..., description="Username for the new user")
 
-class UserCheck(BaseModel):
+class UserCheck(RequestModel):
     username: str = Field(..., description="Username to check")
 
-class BalanceAdd(BaseModel):
+class BalanceAdd(RequestModel):
     username: str = Field(..., description="Username to add balance to")
     amount: int = Field(..., description="Amount to add")
 
-class EthDeposit(BaseModel):
+class EthDeposit(RequestModel):
     username: str = Field(..., description="Username to deposit to")
     amount: str = Field(..., description="ETH amount to deposit (as a string, e.g. '0.1')")
 
-class BalanceCheck(BaseModel):
+class BalanceCheck(RequestModel):
     username: str = Field(..., description="Username to check balance for")
 
-class TransactionCreate(BaseModel):
+class TransactionCreate(RequestModel):
     sender_username: str = Field(..., description="Sender username")
     receiver_username: str = Field(..., description="Receiver username")
     amount: int = Field(..., description="Amount to transfer")
 
-class TransactionLookup(BaseModel):
+class TransactionLookup(RequestModel):
     transaction_id: int = Field(..., description="Transaction ID to look up")
 
-class UserTransactionsLookup(BaseModel):
+class UserTransactionsLookup(RequestModel):
     username: str = Field(..., description="Username to look up transactions for")
 
 # Add models for new auth endpoints
-class UserAuth(BaseModel):
+class UserAuth(RequestModel):
     username: str = Field(..., description="Username")
-    password: str = Field(..., description="Password")
+    # Passphrases may be longer than the other strings; the cap still bounds the hashing work
+    password: str = Field(..., max_length=1024, description="Password")
 
 class UserRegister(UserAuth):
     pass # Inherits username and password
@@ -311,7 +969,7 @@ async def register_user(user_data: UserRegister):
     logger.info(f"Attempting registration for username: {username}")
     
     # 1. Check if username already exists in off-chain store
-    if username in user_credentials_db:
+    if username in _hash_by_user:
         logger.warning(f"Registration failed: Username '{username}' already exists.")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -319,10 +977,10 @@ async def register_user(user_data: UserRegister):
         )
         
     # 2. Hash the password
-    hashed_password = pwd_context.hash(password)
+    hashed_password = await asyncio.get_running_loop().run_in_executor(None, pwd_context.hash, password)
     
     # 3. Create user on the blockchain
-    contract = get_contract()
+    contract = await get_contract()
     if not contract:
          logger.error("Registration failed: Blockchain contract not available.")
          raise HTTPException(status_code=503, detail="Blockchain service unavailable.")
@@ -331,26 +989,24 @@ async def register_user(user_data: UserRegister):
         logger.info(f"Calling smart contract to create user '{username}' on blockchain.")
         # Use the contract function that takes username
         tx = {
-            'from': w3.eth.accounts[0],
             'to': contract.address,
             'gas': 3000000,
-            'nonce': w3.eth.get_transaction_count(w3.eth.accounts[0]),
             'data': contract.encodeABI(fn_name='createUserWithName', args=[username])
         }
-        tx_hash, receipt = send_transaction(tx)
+        tx_hash, receipt = await send_transaction(tx)
         
         # Retrieve the generated UUID from the contract
-        blockchain_uuid = contract.functions.getUserIdByName(username).call()
+        blockchain_uuid = await user_id_for(contract, username)
         logger.info(f"User '{username}' created on blockchain with UUID: {blockchain_uuid}")
         
     except Exception as e:
         logger.error(f"Blockchain user creation failed for '{username}': {e}")
         # Check if it failed because the username *already* existed on chain (maybe created outside this flow)
         try:
-            exists_on_chain = contract.functions.validateUserByName(username).call()
+            exists_on_chain = await contract.functions.validateUserByName(username).call()
             if exists_on_chain:
                  logger.warning(f"Username '{username}' already exists on blockchain, but not in local DB. Attempting to link.")
-                 blockchain_uuid = contract.functions.getUserIdByName(username).call()
+                 blockchain_uuid = await user_id_for(contract, username)
             else:
                  raise HTTPException(status_code=500, detail=f"Failed to create user on blockchain: {str(e)}")
         except Exception as inner_e:
@@ -358,11 +1014,18 @@ async def register_user(user_data: UserRegister):
              raise HTTPException(status_code=500, detail=f"Failed to create or link user on blockchain: {str(inner_e)}")
 
     # 4. Store user credentials (username, hashed_password, uuid) off-chain
-    user_credentials_db[username] = {
-        "hashed_password": hashed_password,
-        "blockchain_uuid": blockchain_uuid
-    }
-    save_user_credentials(user_credentials_db)
+    try:
+        insert_user_credentials(username, hashed_password, blockchain_uuid)
+    except sqlite3.IntegrityError:
+        # Another request registered the same username while this one was on-chain
+        logger.warning(f"Registration failed: Username '{username}' already exists.")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Username already exists"
+        )
+    except sqlite3.Error as e:
+        logger.error(f"Error saving user credentials: {e}")
+        raise HTTPException(status_code=500, detail="Failed to store user credentials.")
     logger.info(f"User '{username}' successfully registered and stored locally.")
     
     return {"success": True, "username": username, "userId": blockchain_uuid}
@@ -376,8 +1039,8 @@ async def login_user(user_data: UserAuth):
     logger.info(f"Login attempt for username: {username}")
     
     # 1. Find user in the off-chain store
-    user_info = user_credentials_db.get(username)
-    if not user_info:
+    hashed_password = _hash_by_user.get(username)
+    if not hashed_password:
         logger.warning(f"Login failed: Username '{username}' not found.")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -386,21 +1049,27 @@ async def login_user(user_data: UserAuth):
         )
         
     # 2. Verify the password
-    hashed_password = user_info.get("hashed_password")
-    if not hashed_password or not pwd_context.verify(password, hashed_password):
+    # Hashing is CPU-bound, so it runs in the threadpool to keep the event loop free
+    verified, new_hash = await asyncio.get_running_loop().run_in_executor(
+        None, pwd_context.verify_and_update, password, hashed_password
+    )
+    if not verified:
         logger.warning(f"Login failed: Invalid password for username '{username}'.")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    blockchain_uuid = _uuid_by_user.get(username)
+    if new_hash:
+        logger.info(f"Upgrading password hash for username '{username}'.")
+        update_password_hash(username, new_hash)
         
     # 3. Check if user still exists on blockchain (optional but good practice)
-    blockchain_uuid = user_info.get("blockchain_uuid")
     if blockchain_uuid:
         try:
-            contract = get_contract()
-            if contract and not contract.functions.validateUser(blockchain_uuid).call():
+            contract = await get_contract()
+            if contract and not await contract.functions.validateUser(blockchain_uuid).call():
                  logger.warning(f"Login failed: User '{username}' (UUID: {blockchain_uuid}) not found on blockchain anymore.")
                  # Decide how to handle this - maybe re-create? For now, deny login.
                  raise HTTPException(status_code=404, detail="User account not found on blockchain.")
@@ -435,27 +1104,25 @@ async def login_user(user_data: UserAuth):
 @app.post("/api/balance/add")
 async def add_balance(balance: BalanceAdd, contract_address: Optional[str] = None):
     """Add balance to a user's account."""
-    contract = get_contract(contract_address)
+    contract = await get_contract(contract_address)
     if not contract:
         raise HTTPException(status_code=404, detail="No contract available. Deploy a contract first.")
         
     try:
         # Get user ID from username
-        user_id = contract.functions.getUserIdByName(balance.username).call()
+        user_id = await user_id_for(contract, balance.username)
         
         # Add balance transaction
         tx = {
-            'from': w3.eth.accounts[0],
             'to': contract.address,
-            'nonce': w3.eth.get_transaction_count(w3.eth.accounts[0]),
             'data': contract.encodeABI(fn_name='userAdd', args=[user_id, balance.amount])
         }
         
         # Send transaction using our helper
-        tx_hash, receipt = send_transaction(tx)
+        tx_hash, receipt = await send_transaction(tx)
             
         # Get new balance
-        new_balance = contract.functions.balances(user_id).call()
+        new_balance = await contract.functions.balances(user_id).call()
         
         return {
             "success": True,
@@ -466,36 +1133,34 @@ async def add_balance(balance: BalanceAdd, contract_address: Optional[str] = Non
             "txHash": tx_hash.hex()
         }
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error adding balance: {str(e)}")
+        raise web3_http_error(e, "Error adding balance")
 
 @app.post("/api/balance/deposit")
 async def deposit_eth(deposit: EthDeposit, contract_address: Optional[str] = None):
     """Deposit ETH to a user's account."""
-    contract = get_contract(contract_address)
+    contract = await get_contract(contract_address)
     if not contract:
         raise HTTPException(status_code=404, detail="No contract available. Deploy a contract first.")
         
     try:
         # Get user ID from username
-        user_id = contract.functions.getUserIdByName(deposit.username).call()
+        user_id = await user_id_for(contract, deposit.username)
         
         # Convert ETH to Wei
         amount_wei = w3.to_wei(float(deposit.amount), 'ether')
         
         # Deposit ETH transaction
         tx = {
-            'from': w3.eth.accounts[0],
             'to': contract.address,
             'value': amount_wei,
-            'nonce': w3.eth.get_transaction_count(w3.eth.accounts[0]),
             'data': contract.encodeABI(fn_name='deposit', args=[user_id])
         }
         
         # Send transaction using our helper
-        tx_hash, receipt = send_transaction(tx)
+        tx_hash, receipt = await send_transaction(tx)
             
         # Get new balance
-        new_balance = contract.functions.balances(user_id).call()
+        new_balance = await contract.functions.balances(user_id).call()
         
         return {
             "success": True,
@@ -507,28 +1172,28 @@ async def deposit_eth(deposit: EthDeposit, contract_address: Optional[str] = Non
             "txHash": tx_hash.hex()
         }
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error depositing ETH: {str(e)}")
+        raise web3_http_error(e, "Error depositing ETH")
 
 @app.post("/api/balance/check")
 async def check_balance(balance_check: BalanceCheck, contract_address: Optional[str] = None):
     """Check a user's balance."""
     try:
         logger.info(f"Checking balance for user: {balance_check.username}")
-        contract = get_contract(contract_address)
+        contract = await get_contract(contract_address)
         if not contract:
             logger.error("No contract available for balance check")
             return {"error": "No contract available. Deploy a contract first or check if Hardhat is running."}
             
         # Get user ID from username
         try:
-            user_id = contract.functions.getUserIdByName(balance_check.username).call()
+            user_id = await user_id_for(contract, balance_check.username)
             logger.info(f"Found user ID {user_id} for '{balance_check.username}'")
         except Exception as e:
             logger.error(f"Error getting user ID: {e}")
             return {"error": f"User '{balance_check.username}' not found"}
         
         # Get balance
-        balance = contract.functions.balances(user_id).call()
+        balance = await cached_call(contract.functions.balances(user_id))
         logger.info(f"Balance for '{balance_check.username}' (ID {user_id}): {balance}")
         
         return {
@@ -545,45 +1210,47 @@ async def check_balance(balance_check: BalanceCheck, contract_address: Optional[
 @app.post("/api/transactions/create")
 async def create_transaction(transaction: TransactionCreate, contract_address: Optional[str] = None):
     """Create a new transaction between users."""
-    contract = get_contract(contract_address)
+    contract = await get_contract(contract_address)
     if not contract:
         raise HTTPException(status_code=404, detail="No contract available. Deploy a contract first.")
         
     try:
         # Get user IDs from usernames
-        sender_id = contract.functions.getUserIdByName(transaction.sender_username).call()
-        receiver_id = contract.functions.getUserIdByName(transaction.receiver_username).call()
+        sender_id, receiver_id = await asyncio.gather(
+            user_id_for(contract, transaction.sender_username),
+            user_id_for(contract, transaction.receiver_username),
+        )
         
         # Create transaction
         tx = {
-            'from': w3.eth.accounts[0],
             'to': contract.address,
-            'nonce': w3.eth.get_transaction_count(w3.eth.accounts[0]),
             'data': contract.encodeABI(fn_name='createTransactionAuto', args=[sender_id, receiver_id, transaction.amount])
         }
         
         # Send transaction using our helper
-        tx_hash, receipt = send_transaction(tx)
+        tx_hash, receipt = await send_transaction(tx)
         
         # Extract transaction ID from event logs
         tx_id = None
+        # The receipt also carries balance events; only the TransactionCreated log is worth decoding
         for log in receipt.logs:
-            # Try to decode the log
-            try:
-                event = contract.events.TransactionCreated().process_log(log)
-                if event:
-                    # The TransactionCreated event has the transaction ID as the 5th parameter
-                    tx_id = event['args']['transactionid']
-                    break
-            except:
-                continue
+            if log["topics"] and bytes(log["topics"][0]) == app.state.tx_created_topic:
+                tx_id = decode_event_log(log)[1]["transactionid"]
+                break
                 
         if tx_id is None:
             # If we can't extract from logs, get the last transaction count
-            tx_count = contract.functions.getTransactionCount().call()
+            tx_count = await contract.functions.getTransactionCount().call()
             if tx_count > 0:
                 tx_id = tx_count  # This assumes the transaction ID is sequential
         
+        # /transactions/all trusts the cache while the feed is live, so don't wait for the feed to see our own write
+        if _tx_feed_live and contract.address == _tx_cache_address:
+            try:
+                await refresh_transactions(contract)
+            except Exception as e:
+                logger.warning(f"Could not refresh transaction cache after {tx_hash.hex()}: {e}")
+        
         return {
             "success": True,
             "senderId": sender_id,
@@ -595,72 +1262,61 @@ async def create_transaction(transaction: TransactionCreate, contract_address: O
             "txHash": tx_hash.hex()
         }
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error creating transaction: {str(e)}")
+        raise web3_http_error(e, "Error creating transaction")
 
 @app.get("/api/transactions/all")
 async def get_all_transactions(contract_address: Optional[str] = None):
     """Get all transactions."""
-    contract = get_contract(contract_address)
+    contract = await get_contract(contract_address)
     if not contract:
         raise HTTPException(status_code=404, detail="No contract available. Deploy a contract first.")
         
     try:
-        tx_count = contract.functions.getTransactionCount().call()
+        if _tx_feed_live and contract.address == _tx_cache_address:
+            tx_count = len(_tx_cache)  # The feed keeps the cache current, so the count needs no RPC
+        else:
+            tx_count = await contract.functions.getTransactionCount().call()
         
         if tx_count == 0:
             return {"transactions": [], "count": 0}
             
-        transactions = []
-        
-        for i in range(tx_count):
-            # Get detailed transaction information
-            tx_result = contract.functions.getTransactionDetailsByIndex(i).call()
-            found, sender, receiver, amount, timestamp, tx_id, prev_hash = tx_result
-            
-            if not found:
-                continue
-                
-            # Try to get usernames
-            sender_name = sender
-            receiver_name = receiver
+        # Fetch transactions not cached yet in one batch, then any participant names not cached yet in a second one
+        details = await transaction_details(contract, tx_count)
             
-            try:
-                sender_name = contract.functions.getUserNameById(sender).call()
-                receiver_name = contract.functions.getUserNameById(receiver).call()
-            except:
-                pass  # If username lookup fails, we'll use the IDs
-                
-            transactions.append({
+        user_ids = {uid for result in details if result[0] for uid in (result[1], result[2])}
+        names = await usernames_for(contract, user_ids)  # IDs with no registered username fall back to the ID
+        
+        name_for = names.get
+        transactions = [
+            {
                 "index": i,
                 "id": tx_id,
-                "sender": {
-                    "id": sender,
-                    "username": sender_name
-                },
-                "receiver": {
-                    "id": receiver,
-                    "username": receiver_name
-                },
+                "sender": {"id": sender, "username": name_for(sender, sender)},
+                "receiver": {"id": receiver, "username": name_for(receiver, receiver)},
                 "amount": amount,
                 "timestamp": timestamp,
                 "datetime": None if timestamp == 0 else str(timestamp),
                 "previousHash": prev_hash.hex()
-            })
+            }
+            for i, (found, sender, receiver, amount, timestamp, tx_id, prev_hash) in enumerate(details)
+            if found
+        ]
             
-        return {"transactions": transactions, "count": tx_count}
+        # Already plain ints and strings, so skip FastAPI's jsonable_encoder walk over every row
+        return SwiftPayJSONResponse({"transactions": transactions, "count": tx_count})
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching transactions: {str(e)}")
+        raise web3_http_error(e, "Error fetching transactions")
 
 @app.post("/api/transactions/by-id")
 async def get_transaction_by_id(lookup: TransactionLookup, contract_address: Optional[str] = None):
     """Get transaction details by ID."""
-    contract = get_contract(contract_address)
+    contract = await get_contract(contract_address)
     if not contract:
         raise HTTPException(status_code=404, detail="No contract available. Deploy a contract first.")
         
     try:
         # Get transaction details
-        tx_result = contract.functions.getTransaction(lookup.transaction_id).call()
+        tx_result = await cached_call(contract.functions.getTransaction(lookup.transaction_id))
         found, sender, receiver, amount, timestamp = tx_result
         
         if not found:
@@ -670,11 +1326,9 @@ async def get_transaction_by_id(lookup: TransactionLookup, contract_address: Opt
         sender_name = sender
         receiver_name = receiver
         
-        try:
-            sender_name = contract.functions.getUserNameById(sender).call()
-            receiver_name = contract.functions.getUserNameById(receiver).call()
-        except:
-            pass  # If username lookup fails, we'll use the IDs
+        names = await usernames_for(contract, {sender, receiver})
+        sender_name = names.get(sender, sender_name)
+        receiver_name = names.get(receiver, receiver_name)  # IDs with no registered username fall back to the ID
             
         return {
             "id": lookup.transaction_id,
@@ -691,183 +1345,162 @@ async def get_transaction_by_id(lookup: TransactionLookup, contract_address: Opt
             "datetime": None if timestamp == 0 else str(timestamp)
         }
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching transaction: {str(e)}")
+        raise web3_http_error(e, "Error fetching transaction")
 
 @app.post("/api/transactions/by-user")
 async def get_transactions_by_user(lookup: UserTransactionsLookup, contract_address: Optional[str] = None):
     """Get all transactions for a user."""
     try:
         logger.info(f"Getting transactions for user: {lookup.username}")
-        contract = get_contract(contract_address)
+        contract = await get_contract(contract_address)
         if not contract:
             logger.error("No contract available for transaction lookup")
             return {"error": "No contract available. Deploy a contract first or check if Hardhat is running."}
             
         # Get user ID from username
         try:
-            user_id = contract.functions.getUserIdByName(lookup.username).call()
+            user_id = await user_id_for(contract, lookup.username)
             logger.info(f"Found user ID {user_id} for '{lookup.username}'")
         except Exception as e:
             logger.error(f"Error getting user ID: {e}")
             return {"error": f"User '{lookup.username}' not found"}
         
-        # Check if user exists
-        user_exists = contract.functions.validateUser(user_id).call()
-        if not user_exists:
-            logger.error(f"User {lookup.username} does not exist")
-            return {"error": f"User '{lookup.username}' does not exist"}
-            
-        # Get user transactions
-        tx_result = contract.functions.getUserTransactions(user_id).call()
-        tx_ids, senders, receivers, amounts = tx_result
+        # user_id_for only returns IDs of existing users, so no separate validateUser round trip is needed
+        tx_ids, senders, receivers, amounts = await contract.functions.getUserTransactions(user_id).call()
         
-        transactions = []
+        # Resolve counterparty names not cached yet in a single batch request
+        names = await usernames_for(contract, {uid for uid in (*senders, *receivers) if uid > 0})  # IDs with no registered username fall back to the ID
         
-        for i in range(len(tx_ids)):
-            # Try to get usernames
-            sender_name = str(senders[i])
-            receiver_name = str(receivers[i])
-            
-            try:
-                if senders[i] > 0:
-                    sender_name = contract.functions.getUserNameById(senders[i]).call()
-                if receivers[i] > 0:
-                    receiver_name = contract.functions.getUserNameById(receivers[i]).call()
-            except Exception as e:
-                logger.warning(f"Error getting username for transaction {tx_ids[i]}: {e}")
-                pass  # If username lookup fails, we'll use the IDs
-                
-            transactions.append({
-                "id": tx_ids[i],
-                "sender": {
-                    "id": senders[i],
-                    "username": sender_name
-                },
-                "receiver": {
-                    "id": receivers[i],
-                    "username": receiver_name
-                },
-                "amount": amounts[i]
-            })
+        name_for = names.get
+        transactions = [
+            {
+                "id": tx_id,
+                "sender": {"id": sender, "username": name_for(sender, str(sender))},
+                "receiver": {"id": receiver, "username": name_for(receiver, str(receiver))},
+                "amount": amount
+            }
+            for tx_id, sender, receiver, amount in zip(tx_ids, senders, receivers, amounts)
+        ]
             
         logger.info(f"Found {len(transactions)} transactions for user '{lookup.username}'")
-        return {
+        # Already plain ints and strings, so skip FastAPI's jsonable_encoder walk over every row
+        return SwiftPayJSONResponse({
             "username": lookup.username,
             "userId": user_id,
             "transactions": transactions,
             "count": len(transactions)
-        }
+        })
     except Exception as e:
         logger.error(f"Error fetching user transactions: {e}")
         logger.error(traceback.format_exc())
         return {"error": f"Error fetching user transactions: {str(e)}"}
 
+def _build_tx_row(tx_id: int, counterparty_id: int, amount: int, names: Dict[int, str], role: str) -> dict:
+    """Build one received/sent row, falling back to the counterparty's ID when it has no registered username."""
+    return {"id": tx_id, role: {"id": counterparty_id, "username": names.get(counterparty_id, counterparty_id)}, "amount": amount}
+
+# Rows serialized per chunk of a streamed listing
+STREAM_CHUNK_ROWS = 256
+
+def stream_listing(fields: dict, list_key: str, rows, count: int) -> StreamingResponse:
+    """Stream {**fields, list_key: [rows...], "count": count} as chunked JSON.
+
+    Rows are produced and serialized a chunk at a time, so a long listing is never held in memory as a
+    whole and the client can start parsing before the tail is encoded.
+    """
+    async def body():
+        yield dump_json(fields)[:-1] + b',"' + list_key.encode() + b'":['
+        separator = b""
+        while chunk := list(itertools.islice(rows, STREAM_CHUNK_ROWS)):
+            yield separator + b",".join(dump_json(row) for row in chunk)
+            separator = b","
+        yield b'],"count":%d}' % count
+
+    return StreamingResponse(body(), media_type="application/json")
+
 @app.post("/api/transactions/received")
 async def get_received_transactions(lookup: UserTransactionsLookup, contract_address: Optional[str] = None):
     """Get transactions received by a user."""
-    contract = get_contract(contract_address)
+    contract = await get_contract(contract_address)
     if not contract:
         raise HTTPException(status_code=404, detail="No contract available. Deploy a contract first.")
         
     try:
-        # Get user ID from username
-        user_id = contract.functions.getUserIdByName(lookup.username).call()
-        
-        # Check if user exists
-        user_exists = contract.functions.validateUser(user_id).call()
+        # Resolve the user, check they exist and fetch their received transactions in one call
+        user_id, user_exists, tx_ids, senders, amounts = await contract.functions.getReceivedByName(lookup.username).call()
         if not user_exists:
             raise HTTPException(status_code=404, detail=f"User {lookup.username} does not exist")
-            
-        # Get received transactions
-        tx_result = contract.functions.userReceived(user_id).call()
-        tx_ids, senders, amounts = tx_result
+        remember_user(contract.address, lookup.username, user_id)
         
-        transactions = []
+        # Resolve every distinct sender name in a single batch request
+        names = await usernames_for(contract, set(senders))  # IDs with no registered username fall back to the ID
         
-        for i in range(len(tx_ids)):
-            # Try to get sender username
-            sender_name = senders[i]
-            
-            try:
-                sender_name = contract.functions.getUserNameById(senders[i]).call()
-            except:
-                pass  # If username lookup fails, we'll use the ID
-                
-            transactions.append({
-                "id": tx_ids[i],
-                "sender": {
-                    "id": senders[i],
-                    "username": sender_name
-                },
-                "amount": amounts[i]
-            })
+        transactions = (
+            _build_tx_row(tx_id, sender, amount, names, "sender")
+            for tx_id, sender, amount in zip(tx_ids, senders, amounts)
+        )
             
-        return {
-            "username": lookup.username,
-            "userId": user_id,
-            "receivedTransactions": transactions,
-            "count": len(transactions)
-        }
+        return stream_listing(
+            {"username": lookup.username, "userId": user_id},
+            "receivedTransactions",
+            transactions,
+            len(tx_ids),
+        )
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching received transactions: {str(e)}")
+        raise web3_http_error(e, "Error fetching received transactions")
 
 @app.post("/api/transactions/sent")
 async def get_sent_transactions(lookup: UserTransactionsLookup, contract_address: Optional[str] = None):
     """Get transactions sent by a user."""
-    contract = get_contract(contract_address)
+    contract = await get_contract(contract_address)
     if not contract:
         raise HTTPException(status_code=404, detail="No contract available. Deploy a contract first.")
         
     try:
-        # Get user ID from username
-        user_id = contract.functions.getUserIdByName(lookup.username).call()
-        
-        # Check if user exists
-        user_exists = contract.functions.validateUser(user_id).call()
+        # Resolve the user, check they exist and fetch their sent transactions in one call
+        user_id, user_exists, tx_ids, receivers, amounts = await contract.functions.getSentByName(lookup.username).call()
         if not user_exists:
             raise HTTPException(status_code=404, detail=f"User {lookup.username} does not exist")
-            
-        # Get sent transactions
-        tx_result = contract.functions.userSent(user_id).call()
-        tx_ids, receivers, amounts = tx_result
+        remember_user(contract.address, lookup.username, user_id)
         
-        transactions = []
+        # Resolve every distinct receiver name in a single batch request
+        names = await usernames_for(contract, set(receivers))  # IDs with no registered username fall back to the ID
         
-        for i in range(len(tx_ids)):
-            # Try to get receiver username
-            receiver_name = receivers[i]
-            
-            try:
-                receiver_name = contract.functions.getUserNameById(receivers[i]).call()
-            except:
-                pass  # If username lookup fails, we'll use the ID
-                
-            transactions.append({
-                "id": tx_ids[i],
-                "receiver": {
-                    "id": receivers[i],
-                    "username": receiver_name
-                },
-                "amount": amounts[i]
-            })
+        transactions = (
+            _build_tx_row(tx_id, receiver, amount, names, "receiver")
+            for tx_id, receiver, amount in zip(tx_ids, receivers, amounts)
+        )
             
-        return {
-            "username": lookup.username,
-            "userId": user_id,
-            "sentTransactions": transactions,
-            "count": len(transactions)
-        }
+        return stream_listing(
+            {"username": lookup.username, "userId": user_id},
+            "sentTransactions",
+            transactions,
+            len(tx_ids),
+        )
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching sent transactions: {str(e)}")
+        raise web3_http_error(e, "Error fetching sent transactions")
 
 # Add a startup event to check blockchain connection
 @app.on_event("startup")
 async def startup_event():
-    logger.info("Starting SwiftPay API...")
+    logger.info(f"Starting SwiftPay API on {type(asyncio.get_running_loop()).__module__} event loop...")
+    logger.info(
+        f"Server limits: limit_concurrency={LIMIT_CONCURRENCY}, "
+        f"limit_max_requests={LIMIT_MAX_REQUESTS}, timeout_keep_alive={TIMEOUT_KEEP_ALIVE}s"
+    )
     
+    # Connect to the node and load the ABI concurrently
+    is_connected, _ = await asyncio.gather(connect_with_retry(), load_contract_abi_async())
+
+    # Precompute selector/topic lookups used to decode call results and logs
+    index_contract_abi()
+
     # Check if contract ABI is loaded
     if CONTRACT_ABI:
-        logger.info("Contract ABI loaded successfully")
+        logger.info(
+            f"Contract ABI loaded successfully ({len(app.state.selector_map)} functions, "
+            f"{len(app.state.event_topic_map)} events indexed)"
+        )
     else:
         logger.warning("Contract ABI not loaded. Contract functionality will be unavailable")
         
@@ -878,20 +1511,46 @@ async def startup_event():
         logger.warning("Contract address not set. Deploy a contract first")
 
     # Check blockchain connection
-    if init_web3():
-        logger.info(f"Connected to blockchain at {HARDHAT_URL}")
+    if is_connected:
+        logger.info(f"Connected to blockchain at {HARDHAT_URL} (up to {RPC_POOL_MAXSIZE} pooled HTTP keep-alive connections)")
+        await warm_rpc_pool()
         
-        # Check if we can get accounts
+        # Cache the sender account and its nonce for writes
         try:
-            accounts = w3.eth.accounts
-            logger.info(f"Found {len(accounts)} accounts")
+            await sync_sender()
+            logger.info(f"Sending transactions from {DEFAULT_SENDER} starting at nonce {_local_nonce}")
         except Exception as e:
             logger.error(f"Error getting accounts: {e}")
     else:
         logger.warning(f"Failed to connect to blockchain at {HARDHAT_URL}")
         logger.warning("Is Hardhat running? Run 'npx hardhat node' to start it")
 
+    # Reconnects happen here from now on instead of inside requests
+    app.state.watchdog = asyncio.create_task(connection_watchdog())
+    start_transaction_feed()
+
+    app.state.ready = True
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    for task_name in ("watchdog", "tx_feed"):
+        task = getattr(app.state, task_name, None)
+        if task is not None:
+            task.cancel()
+    if rpc_session is not None:
+        await rpc_session.close()
+
 if __name__ == "__main__":
     # Run the server
-    logger.info(f"User credentials loaded from: {CREDENTIALS_FILE}")
-    uvicorn.run("app:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    logger.info(f"User credentials loaded from: {CREDENTIALS_DB}")
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        reload=False,
+        loop="uvloop",
+        http="httptools",
+        limit_concurrency=LIMIT_CONCURRENCY,
+        limit_max_requests=LIMIT_MAX_REQUESTS,
+        timeout_keep_alive=TIMEOUT_KEEP_ALIVE,
+    )
\ No newline at end of file
@@ -78,8 +78,8 @@ contract TransactionChain {
         // Generate UUID based on username and timestamp
         uint256 uuid = uint256(keccak256(abi.encodePacked(username, block.timestamp, msg.sender))) % 10000000000;
         
-        // Ensure UUID is unique
-        while(userExists[uuid]) {
+        // Ensure UUID is unique and non-zero (0 means "no such user")
+        while(uuid == 0 || userExists[uuid]) {
             uuid = uint256(keccak256(abi.encodePacked(uuid, block.timestamp))) % 10000000000;
         }
         
@@ -96,10 +96,9 @@ contract TransactionChain {
     /**
      * @dev Gets a user's UUID by their username
      * @param username The username to lookup
-     * @return The user's UUID
+     * @return The user's UUID, or 0 if the username does not exist
      */
     function getUserIdByName(string memory username) public view returns (uint256) {
-        require(usernameExists[username], "Username does not exist");
         return usernameToUuid[username];
     }
 
@@ -113,6 +112,19 @@ contract TransactionChain {
         return uuidToUsername[uuid];
     }
     
+    /**
+     * @dev Gets a user's username by their UUID without reverting on unknown UUIDs
+     * @param uuid The UUID to lookup
+     * @return The user's username ("" if the user does not exist)
+     * @return true if the user exists, false otherwise
+     */
+    function tryGetUserNameById(uint256 uuid) public view returns (string memory, bool) {
+        if (!userExists[uuid]) {
+            return ("", false);
+        }
+        return (uuidToUsername[uuid], true);
+    }
+    
     /**
      * @dev Checks if a user exists by their username
      * @param username The username to check
@@ -124,11 +136,11 @@ contract TransactionChain {
     
     /**
      * @dev Creates a new user with the given UUID
-     * @param uuid The user's UUID
-     * @return true if user was created, false if user already exists
+     * @param uuid The user's UUID (must be non-zero)
+     * @return true if user was created, false if user already exists or uuid is 0
      */
     function createUser(uint256 uuid) public returns (bool) {
-        if (userExists[uuid]) {
+        if (uuid == 0 || userExists[uuid]) {
             return false;
         }
         
@@ -519,4 +531,54 @@ contract TransactionChain {
         return (txIds, receivers, amounts);
     }
 
+    /**
+     * @dev Looks up a user by username and returns the transactions they received, in one call
+     * @param username The username to lookup
+     * @return userId The user's UUID (0 if the username does not exist)
+     * @return exists Whether the username exists
+     * @return txIds Array of transaction IDs
+     * @return senders Array of sender UUIDs
+     * @return amounts Array of transaction amounts
+     */
+    function getReceivedByName(string memory username) public view returns (
+        uint256 userId,
+        bool exists,
+        uint256[] memory txIds,
+        uint256[] memory senders,
+        uint256[] memory amounts
+    ) {
+        if (!usernameExists[username]) {
+            return (0, false, txIds, senders, amounts);
+        }
+
+        userId = usernameToUuid[username];
+        (txIds, senders, amounts) = userReceived(userId);
+        return (userId, userExists[userId], txIds, senders, amounts);
+    }
+
+    /**
+     * @dev Looks up a user by username and returns the transactions they sent, in one call
+     * @param username The username to lookup
+     * @return userId The user's UUID (0 if the username does not exist)
+     * @return exists Whether the username exists
+     * @return txIds Array of transaction IDs
+     * @return receivers Array of receiver UUIDs
+     * @return amounts Array of transaction amounts
+     */
+    function getSentByName(string memory username) public view returns (
+        uint256 userId,
+        bool exists,
+        uint256[] memory txIds,
+        uint256[] memory receivers,
+        uint256[] memory amounts
+    ) {
+        if (!usernameExists[username]) {
+            return (0, false, txIds, receivers, amounts);
+        }
+
+        userId = usernameToUuid[username];
+        (txIds, receivers, amounts) = userSent(userId);
+        return (userId, userExists[userId], txIds, receivers, amounts);
+    }
+
 }
\ No newline at end of file
@@ -1,12 +1,18 @@
-import os
 import subprocess
 import time
 import socket
 import json
+from pathlib import Path
+
+# Hardhat project checkout; "~" has to be expanded here since no shell is involved
+PROJECT_ROOT = Path("~/Documents/GitHub/SwiftPay").expanduser()
+CHECK_SCRIPT = PROJECT_ROOT / "scripts" / "check_deployment.js"
 
 def is_port_in_use(port):
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        return s.connect_ex(('localhost', port)) == 0
+        # A firewalled port drops the SYN instead of refusing it, so don't wait out the OS connect timeout
+        s.settimeout(0.2)
+        return s.connect_ex(('127.0.0.1', port)) == 0
 
 # Check if hardhat node is running on default port 8545
 if is_port_in_use(8545):
@@ -30,25 +36,10 @@ else:
         print("Waiting for node to start...")
         time.sleep(5)  # Wait a bit for the node to initialize
 
-# Check contract deployment
-print("\nChecking if contract is deployed...")
-
-result = subprocess.run(
-    "cd ~/Documents/GitHub/SwiftPay && npx hardhat run scripts/check_deployment.js --network localhost",
-    shell=True,
-    capture_output=True,
-    text=True
-)
-
-print(result.stdout)
-if result.stderr:
-    print(f"Errors: {result.stderr}")
-
 # Create check_deployment.js if it doesn't exist
-if not os.path.exists("~/Documents/GitHub/SwiftPay/scripts/check_deployment.js"):
-    os.makedirs("~/Documents/GitHub/SwiftPay/scripts", exist_ok=True)
-    with open("~/Documents/GitHub/SwiftPay/scripts/check_deployment.js", "w") as f:
-        f.write('''
+if not CHECK_SCRIPT.exists():
+    CHECK_SCRIPT.parent.mkdir(parents=True, exist_ok=True)
+    CHECK_SCRIPT.write_text('''
 const { ethers } = require("hardhat");
 
 async function main() {
@@ -102,7 +93,21 @@ async function main() {
 }
 
 main().catch(console.error);
-        ''')
+    ''')
+
+# Check contract deployment
+print("\nChecking if contract is deployed...")
+
+result = subprocess.run(
+    ["npx", "hardhat", "run", "scripts/check_deployment.js", "--network", "localhost"],
+    cwd=PROJECT_ROOT,
+    capture_output=True,
+    text=True
+)
+
+print(result.stdout)
+if result.stderr:
+    print(f"Errors: {result.stderr}")
 
 print("\nTroubleshooting steps if your contract isn't connecting:")
 print("1. Make sure Hardhat node is running in a separate terminal:")
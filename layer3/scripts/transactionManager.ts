@@ -129,6 +129,10 @@ async function balanceManagement(contract: any) {
                 try {
                     // First get the user ID from username
                     const userId = await contract.getUserIdByName(addUsername);
+                    if (userId == 0n) {
+                        console.log(`User "${addUsername}" does not exist`);
+                        break;
+                    }
                     const tx = await contract.userAdd(userId, addAmount);
                     await tx.wait();
                     const newBalance = await contract.balances(userId);
@@ -156,6 +160,10 @@ async function balanceManagement(contract: any) {
                 const balanceUsername = await askQuestion("Enter username: ");
                 try {
                     const userId = await contract.getUserIdByName(balanceUsername);
+                    if (userId == 0n) {
+                        console.log(`User "${balanceUsername}" does not exist`);
+                        break;
+                    }
                     const balance = await contract.balances(userId);
                     console.log(`Balance for user ${balanceUsername}: ${balance}`);
                 } catch (error) {
@@ -329,8 +337,8 @@ async function showUserTransactions(contract: any) {
     
     try {
         const userId = await contract.getUserIdByName(username);    
-        const userExists = await contract.validateUser(userId);
-        if (!userExists) {
+        // getUserIdByName returns 0 for unknown usernames
+        if (userId == 0n) {
             console.log(`User "${username}" does not exist.`);
             return;
         }
@@ -372,8 +380,8 @@ async function showReceivedTransactions(contract: any) {
     
     try {
         const userId = await contract.getUserIdByName(username);
-        const userExists = await contract.validateUser(userId);
-        if (!userExists) {
+        // getUserIdByName returns 0 for unknown usernames
+        if (userId == 0n) {
             console.log(`User "${username}" does not exist.`);
             return;
         }
@@ -412,8 +420,8 @@ async function showSentTransactions(contract: any) {
     
     try {
         const userId = await contract.getUserIdByName(username);
-        const userExists = await contract.validateUser(userId);
-        if (!userExists) {
+        // getUserIdByName returns 0 for unknown usernames
+        if (userId == 0n) {
             console.log(`User "${username}" does not exist.`);
             return;
         }
@@ -82,6 +82,34 @@ describe("TransactionChain", function () {
       // Verify balance
       expect(await transactionChain.balances(uuid)).to.equal(depositAmount);
     });
+
+    it("Should return 0 for unknown usernames and refuse UUID 0", async function () {
+      const { transactionChain } = await loadFixture(deployTransactionChainFixture);
+
+      expect(await transactionChain.getUserIdByName("nobody")).to.equal(0);
+
+      expect(await transactionChain.createUser.staticCall(0)).to.equal(false);
+      await expect(transactionChain.createUser(0))
+        .to.not.emit(transactionChain, "UserCreated");
+
+      await transactionChain.createUserWithName("alice");
+      expect(await transactionChain.getUserIdByName("alice")).to.not.equal(0);
+    });
+
+    it("Should look up usernames by ID without reverting", async function () {
+      const { transactionChain } = await loadFixture(deployTransactionChainFixture);
+
+      await transactionChain.createUserWithName("alice");
+      const alice = await transactionChain.getUserIdByName("alice");
+
+      const [name, ok] = await transactionChain.tryGetUserNameById(alice);
+      expect(name).to.equal("alice");
+      expect(ok).to.equal(true);
+
+      const [missingName, missingOk] = await transactionChain.tryGetUserNameById(12345);
+      expect(missingName).to.equal("");
+      expect(missingOk).to.equal(false);
+    });
   });
 
   describe("Transaction Processing", function () {
@@ -191,5 +219,44 @@ describe("TransactionChain", function () {
       expect(amounts[0]).to.equal(amount1);
       expect(txIds[1]).to.equal(txid2);
     });
+
+    it("Should return received and sent transactions by username", async function () {
+      const { transactionChain } = await loadFixture(deployTransactionChainFixture);
+
+      const amount = ethers.parseEther("0.1");
+
+      await transactionChain.createUserWithName("alice");
+      await transactionChain.createUserWithName("bob");
+      const alice = await transactionChain.getUserIdByName("alice");
+      const bob = await transactionChain.getUserIdByName("bob");
+      await transactionChain.userAdd(alice, ethers.parseEther("1.0"));
+      await transactionChain.createTransactionAuto(alice, bob, amount);
+
+      const [receivedId, receivedExists, receivedTxIds, senders, receivedAmounts] =
+        await transactionChain.getReceivedByName("bob");
+      expect(receivedId).to.equal(bob);
+      expect(receivedExists).to.equal(true);
+      expect(receivedTxIds.length).to.equal(1);
+      expect(senders[0]).to.equal(alice);
+      expect(receivedAmounts[0]).to.equal(amount);
+
+      const [sentId, sentExists, sentTxIds, receivers] = await transactionChain.getSentByName("alice");
+      expect(sentId).to.equal(alice);
+      expect(sentExists).to.equal(true);
+      expect(sentTxIds[0]).to.equal(receivedTxIds[0]);
+      expect(receivers[0]).to.equal(bob);
+    });
+
+    it("Should report unknown usernames without reverting", async function () {
+      const { transactionChain } = await loadFixture(deployTransactionChainFixture);
+
+      const [userId, exists, txIds] = await transactionChain.getReceivedByName("nobody");
+      expect(userId).to.equal(0);
+      expect(exists).to.equal(false);
+      expect(txIds.length).to.equal(0);
+
+      const [, sentExists] = await transactionChain.getSentByName("nobody");
+      expect(sentExists).to.equal(false);
+    });
   });
 });
\ No newline at end of file